@@ -11,16 +11,13 @@ public domain within the United States.
 2016-02-24  David A. Riggs, Physical Science Tech, Lava Beds National Monument
 """
 
-from __future__ import print_function
-
 import sys
+import io
 import re
+import numbers
 import csv
-from datetime import datetime, timedelta, tzinfo
-try:
-    from StringIO import StringIO
-except ImportError:
-    from io import StringIO
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
 
 
 __version__ = '0.0.2-dev'
@@ -35,26 +32,42 @@ TIME_FMTS = [
 ]
 
 
-TZ_REGEX = re.compile('GMT\s?[-+]\d\d:\d\d')
-SN_REGEX = re.compile('(?:LGR S/N: |Serial Number:)(\d+)')
+TZ_REGEX = re.compile(r'GMT\s?[-+]\d\d:\d\d')
+HEADER_REGEX = re.compile(r'(?:LGR S/N: |Serial Number:)(?P<sn>\d+)|(?P<tz>GMT\s?[-+]\d\d:\d\d)')  # one pass for SN and TZ
 
 
 class TZFixedOffset(tzinfo):
     """
     A fixed-offset timezone implementation for HOBO format `GMT-07:00`.
+
+    Instances are interned by offset, so equal timezones are also identical.
+    Each also carries an equivalent C-implemented `datetime.timezone`, which
+    is what the reader attaches to parsed timestamps.
     """
 
-    def __init__(self, offset):
-        if type(offset) in (int, float):
-            self.offset_hrs = offset
-        elif type(offset) == str:
+    _cache = {}
+
+    def __new__(cls, offset):
+        if isinstance(offset, numbers.Real):  # includes bool and numpy scalars
+            offset_hrs = int(offset) if isinstance(offset, numbers.Integral) else float(offset)
+        elif isinstance(offset, str):
             if not TZ_REGEX.match(offset) or offset[-2:] != '00':
                 raise ValueError(offset)
-            self.offset_hrs = int(offset[-6:-3])  # extract whole hour and sign
+            offset_hrs = int(offset[-6:-3])  # extract whole hour and sign
         else:
             raise ValueError(offset)
-        self.offset = timedelta(hours=self.offset_hrs)
-    
+        self = cls._cache.get(offset_hrs)
+        if self is None:
+            self = super(TZFixedOffset, cls).__new__(cls)
+            self.offset_hrs = offset_hrs
+            self.offset = timedelta(hours=offset_hrs)
+            self._stdlib_tz = timezone(self.offset, str(self))
+            self = cls._cache.setdefault(offset_hrs, self)
+        return self
+
+    def __getinitargs__(self):
+        return self.offset_hrs,
+
     def utcoffset(self, dt):
         return self.offset
     
@@ -68,21 +81,212 @@ class TZFixedOffset(tzinfo):
         return 'GMT%+03d:00' % self.offset_hrs
 
     def __eq__(self, other):
-        return other is not None and self.offset == other.offset
+        if isinstance(other, TZFixedOffset):
+            return self.offset_hrs == other.offset_hrs
+        return isinstance(other, timezone) and self.offset == other.utcoffset(None)
+
+    def __hash__(self):
+        return hash(self.offset)  # consistent with datetime.timezone
 
     def __repr__(self):
         return str(self)
 
 
+def _fast_timestamp(s):
+    """Slice a HOBOware or MX2301 timestamp directly into integer components"""
+    if s[4] == '-':  # HOBO MX2301: 2018-05-03 08:08:23
+        # fromisoformat() alone would also take other separators, e.g. '2018-05-03T08:08:23'
+        if len(s) != 19 or s[7] != '-' or s[10] != ' ' or s[13] != ':' or s[16] != ':':
+            raise ValueError(s)
+        return datetime.fromisoformat(s)
+    # Hoboware export: 05/25/00 10:52:42 AM
+    date, time, ampm = s.split(' ')
+    year, month, day = _hoboware_date(date)
+    hour, minute, second = time.split(':')
+    hour = int(hour)
+    if not 1 <= hour <= 12:  # %I is a 12-hour clock
+        raise ValueError(s)
+    if ampm == 'PM':
+        if hour != 12:
+            hour += 12
+    elif ampm == 'AM':
+        if hour == 12:
+            hour = 0
+    else:
+        raise ValueError(s)
+    return datetime(year, month, day, hour, int(minute), int(second))
+
+
+@lru_cache(maxsize=64)
+def _hoboware_date(date):
+    """Parse the `%m/%d/%y` part of a HOBOware timestamp to (year, month, day), memoized"""
+    month, day, year = date.split('/')
+    if len(year) != 2:
+        raise ValueError(date)
+    year = int(year)
+    year += 2000 if year < 69 else 1900  # same pivot as strptime's %y
+    return year, int(month), int(day)
+
+
+_last_fmt = [None]  # index of the TIME_FMTS entry strptime last needed; None while the fast path works
+
+
+def _parse_timestamp(s):
+    """Parse a naive DateTime, first trying whichever parser succeeded last time"""
+    last = _last_fmt[0]
+    if last is not None:
+        try:
+            return datetime.strptime(s, TIME_FMTS[last])
+        except ValueError:
+            pass
+    try:
+        dt = _fast_timestamp(s)
+        _last_fmt[0] = None
+        return dt
+    except (ValueError, IndexError):
+        pass  # fall back to the slower, more lenient strptime formats
+    for i, fmt in enumerate(TIME_FMTS):
+        if i == last:
+            continue
+        try:
+            dt = datetime.strptime(s, fmt)
+            _last_fmt[0] = i
+            return dt
+        except ValueError:
+            pass
+    raise ValueError('time data "%s" does not match formats: %s' % (s, ', '.join(TIME_FMTS)))
+
+
 def timestamp(s, tz=None):
     """Parse a HOBO timestamp value to Python DateTime"""
+    dt = _parse_timestamp(s)
+    return dt.replace(tzinfo=tz) if tz else dt
+
+
+def _read_int(row, pos, width):
+    """Read 1 to `width` ASCII digits from byte array `row` at `pos`, return (value, end position) or (-1, pos)"""
+    end = pos
+    value = 0
+    while end < row.shape[0] and end - pos < width and 48 <= row[end] <= 57:
+        value = value * 10 + int(row[end]) - 48
+        end += 1
+    return (value, end) if end > pos else (-1, pos)
+
+
+def _hoboware_epoch_seconds(buf, out):
+    """
+    Fill `out` with seconds since the epoch for each row of `buf`, a 2D uint8
+    array of NUL-padded `%m/%d/%y %I:%M:%S %p` timestamps. Returns False
+    as soon as a row doesn't look like a HOBOware timestamp.
+    """
+    n = buf.shape[1]
+    for i in range(buf.shape[0]):
+        row = buf[i]
+        month, pos = _read_int(row, 0, 2)
+        if month < 0 or pos >= n or row[pos] != 47:  # '/'
+            return False
+        day, pos = _read_int(row, pos + 1, 2)
+        if day < 0 or pos >= n or row[pos] != 47:  # '/'
+            return False
+        year, end = _read_int(row, pos + 1, 2)
+        if end - pos != 3 or end >= n or row[end] != 32:  # exactly two digits, then ' '
+            return False
+        hour, pos = _read_int(row, end + 1, 2)
+        if hour < 0 or pos >= n or row[pos] != 58:  # ':'
+            return False
+        minute, pos = _read_int(row, pos + 1, 2)
+        if minute < 0 or pos >= n or row[pos] != 58:  # ':'
+            return False
+        second, pos = _read_int(row, pos + 1, 2)
+        if second < 0 or pos + 2 >= n or row[pos] != 32 or row[pos + 2] != 77:  # ' ', then 'AM' or 'PM'
+            return False
+        if pos + 3 < n and row[pos + 3] != 0:  # anything after the 'M' but padding
+            return False
+        if not 1 <= month <= 12 or not 1 <= hour <= 12 or minute > 59 or second > 59:
+            return False
+        if row[pos + 1] == 80:  # 'P'
+            if hour != 12:
+                hour += 12
+        elif row[pos + 1] == 65:  # 'A'
+            if hour == 12:
+                hour = 0
+        else:
+            return False
+        year += 2000 if year < 69 else 1900  # same pivot as strptime's %y
+        leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+        mdays = 29 if month == 2 and leap else (28 if month == 2 else (30 if month in (4, 6, 9, 11) else 31))
+        if not 1 <= day <= mdays:
+            return False
+        # days since 1970-01-01, per Howard Hinnant's days_from_civil()
+        y = year - 1 if month <= 2 else year
+        era = y // 400
+        yoe = y - era * 400
+        doy = (153 * (month - 3 if month > 2 else month + 9) + 2) // 5 + day - 1
+        days = era * 146097 + yoe * 365 + yoe // 4 - yoe // 100 + doy - 719468
+        out[i] = days * 86400 + hour * 3600 + minute * 60 + second
+    return True
+
+
+_kernel = False  # numba-compiled _hoboware_epoch_seconds, None without numba, False until first use
+
+
+def _compiled_kernel():
+    """Import numba and compile the HOBOware timestamp kernel on first use, None if numba isn't installed"""
+    global _kernel, _read_int
+    if _kernel is False:
+        try:
+            from numba import njit
+        except ImportError:  # bulk HOBOware timestamps are parsed by pandas instead
+            _kernel = None
+        else:
+            _read_int = njit(cache=True)(_read_int)  # compiled first, _hoboware_epoch_seconds calls it
+            _kernel = njit(cache=True)(_hoboware_epoch_seconds)
+    return _kernel
+
+
+def _timestamps(values):
+    """Parse a pandas Series of HOBO timestamp strings to naive datetimes"""
+    import numpy as np
+    import pandas as pd
+    kernel = _compiled_kernel() if len(values) else None
+    if kernel is not None:
+        try:
+            buf = values.to_numpy(dtype='S')
+        except UnicodeEncodeError:
+            buf = None
+        if buf is not None:
+            seconds = np.empty(len(buf), dtype=np.int64)
+            if kernel(buf.view(np.uint8).reshape(len(buf), -1), seconds):
+                return pd.Series(seconds.astype('datetime64[s]'), index=values.index)
     for fmt in TIME_FMTS:
         try:
-            dt = datetime.strptime(s, fmt)
-            return dt.replace(tzinfo=tz) if tz else dt
-        except ValueError as e:
+            return pd.to_datetime(values, format=fmt)
+        except ValueError:
             pass
-    raise ValueError('time data "%s" does not match formats: %s' % (s, ', '.join(TIME_FMTS)))
+    raise ValueError('time data does not match formats: %s' % ', '.join(TIME_FMTS))
+
+
+def _arrow_tz(tz):
+    """Arrow timezone string for a tzinfo: a `+HH:MM` offset if fixed, otherwise its name"""
+    offset = tz.utcoffset(None)
+    if offset is None:
+        return str(tz)
+    minutes = int(offset.total_seconds()) // 60
+    return '%s%02d:%02d' % ('-' if minutes < 0 else '+', abs(minutes) // 60, abs(minutes) % 60)
+
+
+# source for HoboCSVReader._specialize_iter_rows(), the %(...)s fields are filled in per file
+_ITER_ROWS_TEMPLATE = """
+def iter_rows(reader, _timestamp=_timestamp, _tz=_tz, _as_tz=_as_tz, _float=float):
+    for row in reader:
+        val = row[%(itemp)d]
+        if not val or val.isspace():  # is this too lenient?
+            continue  # skip event-only rows
+        val = row[0]
+        if not val or val.isspace():
+            continue  # skip blank rows
+        yield _timestamp(row[%(itimestamp)d], _tz)%(astimezone)s, _float(row[%(itemp)d]), %(rh)s, %(batt)s
+"""
 
 
 class HoboCSVReader(object):
@@ -91,8 +295,10 @@ class HoboCSVReader(object):
     battery) rows.
 
     :param str fname: CSV filename
-    :param tzinfo as_timezone: explicit timezone to cast timestamps to
-    :param bool strict: whether we should be strict or lenient in parsing CSV
+    :param tzinfo as_timezone: explicit timezone to cast timestamps to; if the file has no timezone
+        header, its timestamps are taken to be in local time
+    :param bool strict: whether we should be strict or lenient in parsing CSV; lenient parsing
+        splits unquoted rows on commas directly, bypassing the csv module
 
     :raises Exception: if this doesn't appear to be a HOBOware or BoxCar exported CSV
     :raises ValueError: if required columns representing timestamp or temperature can't be located
@@ -106,20 +312,39 @@ class HoboCSVReader(object):
 
     def __init__(self, fname, as_timezone=None, strict=True):
         self.fname = fname
-        self._f = open(fname, 'rt')
+        self._f = open(fname, 'rb', buffering=1 << 20)
 
         self._itimestamp, self._itemp, self._irh, self._ibatt, self.title, self.sn = None, None, None, None, None, None
-        header = self._find_headers()
+        tz = self._find_headers()
         if self._itimestamp is None:
             raise ValueError('Unable to find required timestamp column!')
         if self._itemp is None:
             raise ValueError('Unable to find required temperature column!')
 
-        tz_match = TZ_REGEX.search(header)
-        self.tz = TZFixedOffset(tz_match.group()) if tz_match else None
-        self.as_timezone = TZFixedOffset(as_timezone) if type(as_timezone) in (int, float, str) else as_timezone
+        self.tz = TZFixedOffset(tz) if tz else None
+        self.as_timezone = TZFixedOffset(as_timezone) \
+            if isinstance(as_timezone, (numbers.Real, str)) and not isinstance(as_timezone, bool) else as_timezone
+        # stdlib equivalents, so per-row tz handling runs in C rather than calling back into TZFixedOffset
+        self._tz = getattr(self.tz, '_stdlib_tz', self.tz)
+        self._as_tz = getattr(self.as_timezone, '_stdlib_tz', self.as_timezone)
+        self._iter_rows = self._specialize_iter_rows()
         
-        self._reader = csv.reader(self._f, strict=strict)
+        # text decoding only for the row-by-row readers, bulk readers hand pandas the raw bytes;
+        # we only need ASCII, so non-UTF-8 bytes (e.g. from a cp1252 export) are just replaced
+        self._text = io.TextIOWrapper(self._f, encoding='utf-8', errors='replace', newline='')
+        self._reader = csv.reader(self._text, strict=strict) if strict else self._split_rows()
+
+    def _split_rows(self):
+        """Lenient row reader: plain `str.split` for unquoted lines, csv module only for quoted ones"""
+        ncols = max(i for i in (self._itimestamp, self._itemp, self._irh, self._ibatt) if i is not None) + 1
+        for line in self._text:
+            if '"' in line:
+                row = next(csv.reader([line], strict=False))
+            else:
+                row = line.rstrip('\r\n').split(',')
+            if len(row) < ncols:
+                continue  # skip blank or truncated rows
+            yield row
 
     def _find_col_timestamp(self, headers):
         for i, header in enumerate(headers):
@@ -147,22 +372,30 @@ class HoboCSVReader(object):
 
     def _find_columns(self, header):
         """Find and set integer index for (timestamp, temp, RH, battery) as private ivars"""
-        headers = next(csv.reader(StringIO(header)))
+        if '"' in header:
+            headers = next(csv.reader([header]))  # quoted names like "Date Time, GMT-07:00" contain commas
+        else:
+            headers = header.rstrip('\r\n').split(',')
         self._itimestamp = self._find_col_timestamp(headers)
         self._itemp = self._find_col_temperature(headers)
         self._irh = self._find_col_rh(headers)
         self._ibatt = self._find_col_battery(headers)
 
     def _find_headers(self):
+        """Consume preamble lines through the column header line, return the header's timezone string (if any)"""
         while self._itimestamp is None:
-            header = next(self._f)
+            header = next(self._f).decode('utf-8', 'replace')  # e.g. a cp1252 degree sign from HOBOware on Windows
             if self.title is None:
                 self.title = header.strip()  # TODO: rip out "Plot Title:"
-            if self.sn is None:
-                sn_match = SN_REGEX.search(header)
-                self.sn = sn_match.groups()[0] if sn_match else None
+            tz = None
+            for match in HEADER_REGEX.finditer(header):
+                if match.lastgroup == 'sn':
+                    if self.sn is None:
+                        self.sn = match.group('sn')
+                elif tz is None:
+                    tz = match.group('tz')
             self._find_columns(header)
-        return header
+        return tz
 
     def __iter__(self):
         """
@@ -171,18 +404,100 @@ class HoboCSVReader(object):
         :return: yields (timestamp, temperature, RH, battery)
         :rtype: tuple(datetime, float, float, float)
         """
+        return self._iter_rows(self._reader)
+
+    def _specialize_iter_rows(self):
+        """
+        Generate the row iterator for this file's column layout and timezones, so
+        the per-row code has no branches on which optional columns or timezone
+        conversion are present.
+        """
+        rhi, bi = self._irh, self._ibatt
+        src = _ITER_ROWS_TEMPLATE % dict(
+            itimestamp=self._itimestamp,
+            itemp=self._itemp,
+            astimezone='.astimezone(_as_tz)' if self._as_tz else '',
+            rh='(_float(row[%d]) if row[%d] else None)' % (rhi, rhi) if rhi is not None else 'None',
+            batt='_float(row[%d])' % bi if bi is not None else 'None',
+        )
+        namespace = {'_timestamp': timestamp, '_tz': self._tz, '_as_tz': self._as_tz}
+        exec(compile(src, '<hobo-specialized>', 'exec'), namespace)
+        return namespace['iter_rows']
+
+    def iter_batched(self, n=1024):
+        """
+        Rather than iterate row-by-row, yield column batches of up to `n` rows
+        each. Requires numpy.
+
+        Values are parsed in bulk into float32 arrays, with NaN for blank values;
+        RH or battery is None if the column is absent.
+
+        :param int n: maximum number of rows per batch
+        :return: yields (timestamps, temperatures, RHs, batts)
+        :rtype: tuple(list, numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        """
+        batch = []
         for row in self._reader:
-            if not row[self._itemp].strip():  # is this too lenient?
+            val = row[self._itemp]
+            if not val or val.isspace():
                 continue  # skip event-only rows
-            if not row[0].strip():
+            val = row[0]
+            if not val or val.isspace():
                 continue  # skip blank rows
-            ts = timestamp(row[self._itimestamp], self.tz)
-            if self.as_timezone:
-                ts = ts.astimezone(self.as_timezone)
-            temp = float(row[self._itemp])
-            rh = float(row[self._irh]) if self._irh is not None and row[self._irh] else None
-            batt = float(row[self._ibatt]) if self._ibatt is not None else None
-            yield ts, temp, rh, batt
+            batch.append(row)
+            if len(batch) == n:
+                yield self._unzip_batch(batch)
+                batch = []
+        if batch:
+            yield self._unzip_batch(batch)
+
+    def _unzip_batch(self, rows):
+        """Convert a list of CSV rows into (timestamps, temperatures, RHs, batts) columns"""
+        import numpy as np
+
+        def floats(i):
+            if i is None:
+                return None
+            # numpy converts the strings in C, and raises on anything that isn't a number
+            return np.array([row[i] if row[i] and not row[i].isspace() else 'nan' for row in rows], dtype=np.float32)
+
+        timestamps = [timestamp(row[self._itimestamp], self._tz) for row in rows]
+        if self._as_tz:
+            timestamps = [ts.astimezone(self._as_tz) for ts in timestamps]
+        return timestamps, floats(self._itemp), floats(self._irh), floats(self._ibatt)
+
+    def _read_csv(self, **kwargs):
+        """Hand the remainder of the file to pandas' C parser, reading only the columns we need"""
+        import pandas as pd
+        cols = [i for i in (self._itimestamp, self._itemp, self._irh, self._ibatt) if i is not None]
+        dtype = dict((i, 'float32') for i in cols if i != self._itimestamp)
+        dtype[self._itimestamp] = str
+        try:
+            return pd.read_csv(self._f, header=None, usecols=cols, dtype=dtype, skipinitialspace=True, engine='c',
+                               encoding_errors='replace', **kwargs)
+        except pd.errors.EmptyDataError:
+            return None  # headers but no data rows
+
+    def _empty_frame(self):
+        """Raw DataFrame with no rows, shaped like the ones _read_csv() returns"""
+        import pandas as pd
+        cols = [i for i in (self._itimestamp, self._itemp, self._irh, self._ibatt) if i is not None]
+        return pd.DataFrame(dict((i, pd.Series(dtype=object if i == self._itimestamp else 'float32')) for i in cols))
+
+    def _parse_frame(self, df):
+        """Drop event-only and blank rows from a raw DataFrame, convert its timestamp column to datetimes"""
+        import pandas as pd
+        df = df.dropna(subset=[self._itimestamp, self._itemp])
+        ts = _timestamps(df[self._itimestamp])
+        if self._tz:
+            ts = ts.dt.tz_localize(self._tz)
+            if self._as_tz:
+                ts = ts.dt.tz_convert(self._as_tz)
+        elif self._as_tz:
+            # no timezone in the header: like __iter__, let astimezone() treat naive timestamps as local time
+            ts = pd.Series([dt.astimezone(self._as_tz) for dt in ts.dt.to_pydatetime()], index=ts.index)
+        df[self._itimestamp] = ts
+        return df
 
     def unzip(self):
         """
@@ -193,6 +508,98 @@ class HoboCSVReader(object):
         """
         return zip(*[row for row in self])
 
+    def unzip_arrays(self):
+        """
+        Like `unzip()`, but parse the file in bulk with pandas and return numpy
+        arrays. Requires pandas.
+
+        Temperature, RH, and battery are float32 with NaN for blank values;
+        RH or battery is None if the column is absent.
+
+        :rtype: tuple of numpy.ndarray (timestamps, temperatures, RHs, batts)
+        """
+        import pandas
+        df = self._read_csv(low_memory=False)
+        df = self._parse_frame(df if df is not None else self._empty_frame())
+        timestamps = pandas.DatetimeIndex(df[self._itimestamp]).to_pydatetime()
+        temps = df[self._itemp].to_numpy()
+        rhs = df[self._irh].to_numpy() if self._irh is not None else None
+        batts = df[self._ibatt].to_numpy() if self._ibatt is not None else None
+        return timestamps, temps, rhs, batts
+
+    def chunks(self, size=65536):
+        """
+        Rather than iterate row-by-row, yield the remaining rows as pandas
+        DataFrames of up to `size` rows each. Requires pandas.
+
+        Columns are named `timestamp`, `temperature`, `rh`, and `battery`;
+        RH and battery columns are omitted if not present in the file.
+
+        :param int size: maximum number of CSV rows per chunk
+        :rtype: iterator of pandas.DataFrame
+        """
+        names = {self._itimestamp: 'timestamp', self._itemp: 'temperature', self._irh: 'rh', self._ibatt: 'battery'}
+        names.pop(None, None)
+        order = [names[i] for i in (self._itimestamp, self._itemp, self._irh, self._ibatt) if i is not None]
+        reader = self._read_csv(chunksize=size, low_memory=True)
+        if reader is None:
+            return  # headers but no data rows
+        with reader:
+            for chunk in reader:
+                yield self._parse_frame(chunk).rename(columns=names)[order]
+
+    def read_arrow(self):
+        """
+        Rather than iterate row-by-row, read the remaining rows into a pyarrow
+        Table using Arrow's multithreaded CSV reader. Requires pyarrow.
+
+        Columns are named `timestamp`, `temperature`, `rh`, and `battery`;
+        RH and battery columns are omitted if not present in the file.
+
+        :rtype: pyarrow.Table
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        from pyarrow import csv as pa_csv
+        names = [(self._itimestamp, 'timestamp'), (self._itemp, 'temperature'), (self._irh, 'rh'), (self._ibatt, 'battery')]
+        names = [('f%d' % i, name) for i, name in names if i is not None]
+        try:
+            table = pa_csv.read_csv(
+                self._f,
+                read_options=pa_csv.ReadOptions(autogenerate_column_names=True, block_size=1 << 20),
+                convert_options=pa_csv.ConvertOptions(include_columns=[col for col, _ in names],
+                                                      column_types=dict((col, pa.string()) for col, _ in names),
+                                                      null_values=[''], strings_can_be_null=True),
+            )
+        except pa.ArrowInvalid as e:
+            if 'Empty CSV file' not in str(e):
+                raise
+            # headers but no data rows
+            table = pa.table(dict((col, pa.array([], pa.string())) for col, _ in names))
+        table = table.rename_columns([name for _, name in names])
+        for i, name in enumerate(table.column_names[1:], 1):
+            # like the other readers, any whitespace-only cell is blank
+            values = pc.utf8_trim_whitespace(table[name])
+            values = pc.if_else(pc.equal(values, ''), pa.scalar(None, pa.string()), values)
+            table = table.set_column(i, name, values.cast(pa.float32()))
+        table = table.filter(pc.and_(pc.is_valid(table['timestamp']), pc.is_valid(table['temperature'])))
+        for fmt in TIME_FMTS:
+            try:
+                ts = pc.strptime(table['timestamp'], format=fmt, unit='s')
+                break
+            except pa.ArrowInvalid:
+                pass
+        else:
+            raise ValueError('time data does not match formats: %s' % ', '.join(TIME_FMTS))
+        if self.tz:
+            ts = pc.assume_timezone(ts, timezone=_arrow_tz(self.tz))
+            if self.as_timezone:
+                ts = ts.cast(pa.timestamp('s', tz=_arrow_tz(self.as_timezone)))
+        elif self.as_timezone:
+            # no timezone in the header: like __iter__, let astimezone() treat naive timestamps as local time
+            ts = pa.array([dt.astimezone(self._as_tz) for dt in ts.to_pylist()], pa.timestamp('s', tz=_arrow_tz(self.as_timezone)))
+        return table.set_column(0, 'timestamp', ts)
+
     def __enter__(self):
         return self
 
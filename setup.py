@@ -12,7 +12,14 @@ setup(
     author='David A. Riggs',
     author_email='david_a_riggs@nps.gov',
     py_modules=['hobo'],
+    python_requires='>=3.7',
     test_suite='test_hobo',
+    extras_require={
+        'numpy': ['numpy'],
+        'pandas': ['pandas'],
+        'numba': ['pandas', 'numba'],
+        'arrow': ['pyarrow'],
+    },
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
@@ -1,8 +1,28 @@
 import os.path
+import pickle
+import tempfile
 import unittest
+from datetime import datetime, timedelta, timezone
 
 import hobo
 
+try:
+	import numpy
+except ImportError:
+	numpy = None
+try:
+	import pandas
+except ImportError:
+	pandas = None
+try:
+	import pyarrow
+except ImportError:
+	pyarrow = None
+
+
+# a HOBOware export that was stopped before logging any data
+HEADER_ONLY_CSV = '"Plot Title: Empty"\r\n"#","Date Time, GMT-07:00","Temp, F (LGR S/N: 1)","RH, % (LGR S/N: 1)"\r\n'
+
 
 class TestTimezones(unittest.TestCase):
 
@@ -20,6 +40,80 @@ class TestTimezones(unittest.TestCase):
 			tz = hobo.TZFixedOffset(offset)
 			self.assertEqual(tz.offset_hrs, offset, desc)
 
+	@unittest.skipUnless(numpy, 'requires numpy')
+	def test_tz_numpy(self):
+		tz = hobo.TZFixedOffset(numpy.int64(-3))  # an offset no other test creates
+		self.assertIs(type(tz.offset_hrs), int)
+		self.assertIs(hobo.TZFixedOffset(-3), tz)
+		self.assertEqual(hobo.TZFixedOffset(numpy.float64(9.5)).offset, timedelta(hours=9.5))
+
+	def test_tz_hashable(self):
+		self.assertEqual(hash(hobo.TZFixedOffset('GMT-08:00')), hash(hobo.TZFixedOffset(-8)))
+		self.assertNotEqual(hobo.TZFixedOffset(-8), hobo.TZFixedOffset(-7))
+		self.assertNotEqual(hobo.TZFixedOffset(-8), None)
+		stdlib_tz = timezone(timedelta(hours=-8))
+		self.assertEqual(hobo.TZFixedOffset(-8), stdlib_tz)
+		self.assertEqual(stdlib_tz, hobo.TZFixedOffset(-8))
+		self.assertEqual(hash(hobo.TZFixedOffset(-8)), hash(stdlib_tz))
+
+	def test_tz_interned(self):
+		self.assertIs(hobo.TZFixedOffset('GMT -08:00'), hobo.TZFixedOffset(-8))
+		self.assertIs(pickle.loads(pickle.dumps(hobo.TZFixedOffset(+5))), hobo.TZFixedOffset(+5))
+
+
+class TestTimestamps(unittest.TestCase):
+
+	def test_timestamp(self):
+		data = [
+			('01/13/17 01:00:00 AM', datetime(2017, 1, 13, 1, 0, 0), 'Hoboware AM'),
+			('01/13/17 12:00:00 AM', datetime(2017, 1, 13, 0, 0, 0), 'Hoboware midnight'),
+			('01/13/17 12:00:00 PM', datetime(2017, 1, 13, 12, 0, 0), 'Hoboware noon'),
+			('05/25/00 10:52:42 PM', datetime(2000, 5, 25, 22, 52, 42), 'Hoboware PM'),
+			('12/31/99 11:59:59 PM', datetime(1999, 12, 31, 23, 59, 59), 'Hoboware 20th century'),
+			('2018-05-03 08:08:23', datetime(2018, 5, 3, 8, 8, 23), 'MX2301'),
+			('1/13/2017 13:00', datetime(2017, 1, 13, 13, 0, 0), 'Excel'),
+		]
+		for value, expected, desc in data:
+			self.assertEqual(hobo.timestamp(value), expected, desc)
+
+	def test_timestamp_mixed_formats(self):
+		data = [
+			('1/13/2017 13:00', 13),
+			('1/13/2017 14:00', 14),
+			('01/13/17 03:00:00 PM', 15),
+			('1/13/2017 16:00', 16),
+		]
+		for value, hour in data:
+			self.assertEqual(hobo.timestamp(value).hour, hour, value)
+
+	@unittest.skipUnless(pandas, 'requires pandas')
+	def test_bulk_timestamps_invalid(self):
+		for value in ('01-13-17 01.00.00 AM', '01/13/17 01:00:00 AMX', '1/2/3 4:5:6 PM'):
+			self.assertRaises(ValueError, hobo._timestamps, pandas.Series([value]))
+
+	def test_timestamp_tz(self):
+		tz = hobo.TZFixedOffset(-8)
+		self.assertEqual(hobo.timestamp('01/13/17 01:00:00 AM', tz).tzinfo, tz)
+
+	def test_timestamp_tzinfo_type(self):
+		tz = hobo.TZFixedOffset(-8)
+		value = '02/29/04 06:30:00 AM'  # not in any sample file
+		self.assertIs(hobo.timestamp(value, timezone(tz.offset)).tzinfo.__class__, timezone)
+		self.assertIs(hobo.timestamp(value, tz).tzinfo, tz)  # not an equal tzinfo of another type
+
+	def test_timestamp_invalid(self):
+		data = [
+			'',
+			'Logged',
+			'13/45/17 01:00:00 AM',
+			'01/13/17 13:00:00 AM',
+			'01/13/17 00:30:00 AM',
+			'2018-05-03T08:08:23',
+			'2018-05-03x08:08:23',
+		]
+		for value in data:
+			self.assertRaises(ValueError, hobo.timestamp, value)
+
 
 class TestSampleData(unittest.TestCase):
 
@@ -31,6 +125,17 @@ class TestSampleData(unittest.TestCase):
 			#self.assertEqual(reader.title, 'Hobo U23-001 Sample Data')  # FIXME: remove BOM and "Plot Title:"
 			self.assertEqual(reader.tz, hobo.TZFixedOffset(-8))
 
+	def test_timestamp_tzinfo(self):
+		fname = os.path.join('test_data', 'U23-001_HOBOware.csv')
+		with hobo.HoboCSVReader(fname) as reader:
+			tznames = set((type(row[0].tzinfo), row[0].tzname()) for row in reader)
+		self.assertEqual(tznames, set([(timezone, 'GMT-08:00')]))
+
+	def test_as_timezone_false(self):
+		fname = os.path.join('test_data', 'U23-001_HOBOware.csv')
+		with hobo.HoboCSVReader(fname, as_timezone=False) as reader:
+			self.assertEqual(next(iter(reader))[0].utcoffset(), timedelta(hours=-8))
+
 	def test_h08_hoboware(self):
 		fname = os.path.join('test_data', 'H08-030-08_HOBOware.csv')
 		with hobo.HoboCSVReader(fname) as reader:
@@ -47,6 +152,159 @@ class TestSampleData(unittest.TestCase):
 			#self.assertEqual(reader.title, 'Hobo H08-030-08 Sample Data')
 			self.assertEqual(reader.tz, hobo.TZFixedOffset(+5))
 
+	def test_lenient(self):
+		for name in ('U23-001_HOBOware.csv', 'H08-030-08_HOBOware.csv', 'MX2301_HOBOmobile.csv'):
+			fname = os.path.join('test_data', name)
+			with hobo.HoboCSVReader(fname) as reader:
+				expected = list(reader)
+			with hobo.HoboCSVReader(fname, strict=False) as reader:
+				self.assertEqual(list(reader), expected, name)
+
+	def _write_csv(self, text):
+		fd, fname = tempfile.mkstemp(suffix='.csv')
+		self.addCleanup(os.remove, fname)
+		with os.fdopen(fd, 'w') as f:
+			f.write(text)
+		return fname
+
+	def test_lenient_quoted_and_short_rows(self):
+		fname = self._write_csv(HEADER_ONLY_CSV + '"1","05/25/00 10:52:42 AM","37.20","102.90"\r\n\r\n2,05/25/00\r\n3,05/25/00 11:24:42 AM,37.00,102.60\r\n')
+		with hobo.HoboCSVReader(fname, strict=False) as reader:
+			rows = list(reader)
+		self.assertEqual([row[1:] for row in rows], [(37.2, 102.9, None), (37.0, 102.6, None)])
+		self.assertEqual(rows[0][0], datetime(2000, 5, 25, 10, 52, 42, tzinfo=hobo.TZFixedOffset(-7)))
+
+	def test_cp1252(self):
+		fname = self._write_csv('')
+		with open(fname, 'wb') as f:
+			f.write('"Plot Title: Windows"\r\n"#","Date Time, GMT-07:00","Temp, \xb0F (LGR S/N: 1)"\r\n1,05/25/00 10:52:42 AM,37.20\r\n'.encode('cp1252'))
+		with hobo.HoboCSVReader(fname) as reader:
+			self.assertEqual(reader.sn, '1')
+			self.assertEqual([row[1] for row in reader], [37.2])
+
+	def _write_naive_csv(self):
+		"""Excel-edited layout: no timezone in the header"""
+		fname = self._write_csv('"Plot Title: Excel"\r\n"#","Date Time","Temp, F"\r\n1,1/13/2017 13:00,31.4\r\n2,7/13/2017 14:00,31.5\r\n')
+		with hobo.HoboCSVReader(fname, as_timezone=0) as reader:
+			expected = [row[0] for row in reader]
+		return fname, expected
+
+	@unittest.skipUnless(pandas, 'requires pandas')
+	def test_bulk_naive_as_timezone(self):
+		fname, expected = self._write_naive_csv()
+		with hobo.HoboCSVReader(fname, as_timezone=0) as reader:
+			self.assertEqual(list(reader.unzip_arrays()[0]), expected)
+		with hobo.HoboCSVReader(fname, as_timezone=0) as reader:
+			self.assertEqual(list(next(reader.chunks())['timestamp']), expected)
+
+	def test_unzip(self):
+		fname = os.path.join('test_data', 'U23-001_HOBOware.csv')
+		with hobo.HoboCSVReader(fname) as reader:
+			expected = list(reader)
+		with hobo.HoboCSVReader(fname) as reader:
+			self.assertEqual(list(reader.unzip()), list(zip(*expected)))
+
+	@unittest.skipUnless(pandas, 'requires pandas')
+	def test_unzip_arrays(self):
+		fname = os.path.join('test_data', 'U23-001_HOBOware.csv')
+		with hobo.HoboCSVReader(fname) as reader:
+			expected = list(reader)
+		with hobo.HoboCSVReader(fname) as reader:
+			timestamps, temps, rhs, batts = reader.unzip_arrays()
+		self.assertEqual(list(timestamps), [row[0] for row in expected])
+		self.assertEqual(len(temps), len(expected))
+		self.assertAlmostEqual(temps[0], expected[0][1], places=4)
+		self.assertAlmostEqual(rhs[-1], expected[-1][2], places=4)
+		self.assertAlmostEqual(batts[-1], expected[-1][3], places=4)
+
+	@unittest.skipUnless(pandas, 'requires pandas')
+	def test_unzip_arrays_header_only(self):
+		fname = self._write_csv(HEADER_ONLY_CSV)
+		with hobo.HoboCSVReader(fname) as reader:
+			self.assertEqual(list(reader.unzip()), [])
+		with hobo.HoboCSVReader(fname) as reader:
+			timestamps, temps, rhs, batts = reader.unzip_arrays()
+		self.assertEqual((len(timestamps), len(temps), len(rhs)), (0, 0, 0))
+		self.assertIsNone(batts)
+
+	@unittest.skipUnless(pandas, 'requires pandas')
+	def test_chunks(self):
+		fname = os.path.join('test_data', 'MX2301_HOBOmobile.csv')
+		with hobo.HoboCSVReader(fname) as reader:
+			expected = list(reader)
+		with hobo.HoboCSVReader(fname) as reader:
+			chunks = list(reader.chunks(size=100))
+		self.assertEqual(list(chunks[0].columns), ['timestamp', 'temperature', 'rh'])
+		self.assertEqual(sum(len(chunk) for chunk in chunks), len(expected))
+		self.assertEqual(chunks[-1]['timestamp'].iloc[-1], expected[-1][0])
+
+	@unittest.skipUnless(pandas, 'requires pandas')
+	def test_chunks_header_only(self):
+		with hobo.HoboCSVReader(self._write_csv(HEADER_ONLY_CSV)) as reader:
+			self.assertEqual(list(reader.chunks()), [])
+
+	@unittest.skipUnless(numpy, 'requires numpy')
+	def test_iter_batched(self):
+		fname = os.path.join('test_data', 'H08-030-08_HOBOware.csv')
+		with hobo.HoboCSVReader(fname) as reader:
+			expected = list(reader)
+		with hobo.HoboCSVReader(fname) as reader:
+			batches = list(reader.iter_batched(n=400))
+		self.assertEqual([len(batch[0]) for batch in batches], [400, 400, len(expected) - 800])
+		timestamps, temps, rhs, batts = batches[-1]
+		self.assertEqual(timestamps[-1], expected[-1][0])
+		self.assertAlmostEqual(temps[-1], expected[-1][1], places=4)
+		self.assertAlmostEqual(rhs[-1], expected[-1][2], places=4)
+		self.assertIsNone(batts)
+
+	@unittest.skipUnless(numpy, 'requires numpy')
+	def test_iter_batched_blank_cells(self):
+		with open(os.path.join('test_data', 'H08-030-08_HOBOware.csv'), 'rb') as f:
+			header = f.readline() + f.readline()
+		fd, fname = tempfile.mkstemp(suffix='.csv')
+		self.addCleanup(os.remove, fname)
+		with os.fdopen(fd, 'wb') as f:
+			f.write(header + b'4,05/25/00 10:52:42 AM,37.20, \r\n5,05/25/00 11:08:42 AM,37.10,\r\n6,05/25/00 11:24:42 AM,37.00,102.60\r\n')
+		with hobo.HoboCSVReader(fname) as reader:
+			(timestamps, temps, rhs, batts), = list(reader.iter_batched())
+		self.assertEqual(list(temps), [numpy.float32(37.2), numpy.float32(37.1), numpy.float32(37.0)])
+		self.assertTrue(numpy.isnan(rhs[0]) and numpy.isnan(rhs[1]))
+		self.assertAlmostEqual(rhs[2], 102.6, places=4)
+
+	@unittest.skipUnless(pyarrow, 'requires pyarrow')
+	def test_read_arrow_naive_as_timezone(self):
+		fname, expected = self._write_naive_csv()
+		with hobo.HoboCSVReader(fname, as_timezone=0) as reader:
+			self.assertEqual(reader.read_arrow()['timestamp'].to_pylist(), expected)
+
+	@unittest.skipUnless(pyarrow, 'requires pyarrow')
+	def test_read_arrow_header_only(self):
+		with hobo.HoboCSVReader(self._write_csv(HEADER_ONLY_CSV)) as reader:
+			table = reader.read_arrow()
+		self.assertEqual(table.num_rows, 0)
+		self.assertEqual(table.column_names, ['timestamp', 'temperature', 'rh'])
+		self.assertEqual(table.schema.types, [pyarrow.timestamp('s', tz='-07:00'), pyarrow.float32(), pyarrow.float32()])
+
+	@unittest.skipUnless(pyarrow, 'requires pyarrow')
+	def test_read_arrow_blank_cells(self):
+		fname = self._write_csv(HEADER_ONLY_CSV + '1,05/25/00 10:52:42 AM,37.20,  \r\n2,05/25/00 11:08:42 AM, \t,1.5\r\n3,05/25/00 11:24:42 AM,37.00,\r\n')
+		with hobo.HoboCSVReader(fname) as reader:
+			table = reader.read_arrow()
+		self.assertEqual(table['temperature'].to_pylist(), [37.20000076293945, 37.0])
+		self.assertEqual(table['rh'].to_pylist(), [None, None])
+
+	@unittest.skipUnless(pyarrow, 'requires pyarrow')
+	def test_read_arrow(self):
+		fname = os.path.join('test_data', 'U23-001_HOBOware.csv')
+		with hobo.HoboCSVReader(fname, as_timezone=0) as reader:
+			expected = list(reader)
+		with hobo.HoboCSVReader(fname, as_timezone=0) as reader:
+			table = reader.read_arrow()
+		self.assertEqual(table.column_names, ['timestamp', 'temperature', 'rh', 'battery'])
+		self.assertEqual(table.num_rows, len(expected))
+		self.assertEqual(table['timestamp'][-1].as_py(), expected[-1][0])
+		self.assertAlmostEqual(table['temperature'][-1].as_py(), expected[-1][1], places=4)
+
 
 if __name__ == '__main__':
 	unittest.main()